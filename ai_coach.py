@@ -1,29 +1,57 @@
+from string import Template
+
 from google import genai
 import streamlit as st
 
+SYSTEM_PROMPT = (
+    "You are a professional trading coach at National Bank. "
+    "Use the following bias report to give the trader specific, "
+    "actionable advice. Be empathetic but data-driven."
+)
+MODEL = "gemini-2.0-flash-lite"
+PROMPT_TEMPLATE = Template("$system\n\nBias Report:\n$summary\n\nTrader asks: $prompt")
+
+
+@st.cache_resource
+def get_client():
+    """
+    Returns a single Gemini client shared across reruns and sessions.
+    """
+    return genai.Client(api_key=st.secrets["GEMINI_API_KEY"])
+
+
+def _build_contents(bias_summary, user_prompt):
+    return PROMPT_TEMPLATE.substitute(system=SYSTEM_PROMPT, summary=bias_summary, prompt=user_prompt)
+
+
 def get_chatbot_response(bias_summary, user_prompt):
     """
     Handles the connection to Gemini and returns the coach's advice.
     """
     try:
-        # 1. Setup Client
-        api_key = st.secrets["GEMINI_API_KEY"]
-        client = genai.Client(api_key=api_key)
-
-        # 2. System Instruction
-        system_prompt = (
-            "You are a professional trading coach at National Bank. "
-            "Use the following bias report to give the trader specific, "
-            "actionable advice. Be empathetic but data-driven."
+        response = get_client().models.generate_content(
+            model=MODEL,
+            contents=_build_contents(bias_summary, user_prompt),
         )
+        return response.text
+
+    except Exception as e:
+        return f"❌ AI Error: {str(e)}"
+
 
-        # 3. Call Model (Using the corrected model name)
-        response = client.models.generate_content(
-            model = "gemini-2.0-flash-lite",
-            contents=f"{system_prompt}\n\nBias Report:\n{bias_summary}\n\nTrader asks: {user_prompt}",
+def stream_chatbot_response(bias_summary, user_prompt):
+    """
+    Same as get_chatbot_response, but yields the advice chunk by chunk
+    (for st.write_stream) so the first tokens render immediately.
+    """
+    try:
+        stream = get_client().models.generate_content_stream(
+            model=MODEL,
+            contents=_build_contents(bias_summary, user_prompt),
         )
-        
-        return response.text
+        for chunk in stream:
+            if chunk.text:
+                yield chunk.text
 
     except Exception as e:
-        return f"❌ AI Error: {str(e)}"
\ No newline at end of file
+        yield f"❌ AI Error: {str(e)}"
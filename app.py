@@ -1,4 +1,4 @@
-from ai_coach import get_chatbot_response
+from ai_coach import get_client, stream_chatbot_response
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -6,10 +6,12 @@ import plotly.graph_objects as go
 import numpy as np
 import time
 import re
+import io
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from google import genai
 from google.genai import errors as genai_errors
 from bias_engine import run_all
+from downsample import CACHE_MAX_ENTRIES, CACHE_TTL, PLOT_MAX_POINTS, hash_df, lttb
 
 # ─────────────────────────────────────────────────────────────
 # PAGE CONFIG
@@ -20,8 +22,7 @@ st.set_page_config(page_title="NBC Bias Detector", layout="wide")
 # API SETUP
 # ─────────────────────────────────────────────────────────────
 try:
-    API_KEY = st.secrets["GEMINI_API_KEY"]
-    client  = genai.Client(api_key=API_KEY)
+    client = get_client()
 except Exception:
     st.error("Please set your GEMINI_API_KEY in Streamlit Secrets.")
     client = None
@@ -68,17 +69,120 @@ with st.sidebar:
     st.caption("Required columns: `timestamp` `buy_sell` `asset` `quantity` `entry_price` `exit_price` `profit_loss` `balance`")
 
 
+# ─────────────────────────────────────────────────────────────
+# CACHED HELPERS (memoised across reruns)
+# ─────────────────────────────────────────────────────────────
+PNL_BUCKET_TRADES = 5000   # per-trade P/L bars switch to hourly sums above this
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+def load_trades(file_bytes: tuple) -> pd.DataFrame:
+    """Parse, concatenate and time-sort the uploaded CSVs (keyed on raw bytes)."""
+    # One worker per file; the pyarrow engine parses each file multithreaded too
+    with ThreadPoolExecutor(max_workers=len(file_bytes)) as pool:
+        dfs = list(pool.map(lambda b: pd.read_csv(io.BytesIO(b), engine="pyarrow"), file_bytes))
+    df_raw = pd.concat(dfs, ignore_index=True)
+    # Parse once at ingest; ISO-8601 skips per-row format inference
+    try:
+        df_raw["timestamp"] = pd.to_datetime(df_raw["timestamp"], format="ISO8601")
+    except ValueError:
+        df_raw["timestamp"] = pd.to_datetime(df_raw["timestamp"])
+    # Low-cardinality labels as categoricals: int codes instead of Python strings
+    for col in ("asset", "buy_sell"):
+        if col in df_raw.columns:
+            df_raw[col] = df_raw[col].astype("category")
+    return df_raw.sort_values("timestamp").reset_index(drop=True)
+
+
+@st.cache_resource(show_spinner=False, hash_funcs={pd.DataFrame: hash_df},
+                   max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+def cached_run_all(df: pd.DataFrame, **thresholds) -> dict:
+    """
+    run_all() memoised on the DataFrame contents + threshold values.
+    Returned as a shared object (no unpickle per hit) — callers must not mutate it.
+    """
+    return run_all(df, **thresholds)
+
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: hash_df},
+               max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+def balance_figure(df: pd.DataFrame) -> go.Figure:
+    keep = lttb(df["timestamp"].to_numpy().astype("datetime64[ns]").view("i8"),
+                df["balance"].to_numpy(), PLOT_MAX_POINTS)
+    fig  = px.line(df.iloc[keep], x="timestamp", y="balance", title="Account Balance Over Time")
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)")
+    return fig
+
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: hash_df},
+               max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+def pnl_figure(df: pd.DataFrame) -> go.Figure:
+    if len(df) > PNL_BUCKET_TRADES:
+        pl    = df.resample("1h", on="timestamp")["profit_loss"].sum()
+        title = "P/L Per Hour"
+    else:
+        pl    = df.set_index("timestamp")["profit_loss"]
+        title = "P/L Per Trade"
+    colors = np.where(pl.to_numpy() >= 0, "green", "red")
+    fig    = go.Figure(go.Bar(x=pl.index, y=pl.to_numpy(), marker_color=colors))
+    fig.update_layout(title=title, xaxis_title="Time", yaxis_title="P/L")
+    return fig
+
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: hash_df},
+               max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+def hourly_figure(df: pd.DataFrame, max_per_hour: int) -> go.Figure:
+    hourly_counts = df.set_index("timestamp").resample("1h").size().reset_index(name="trades")
+    current_max   = hourly_counts["trades"].max()
+    chart_ceiling = max(current_max, max_per_hour, 100)
+    return px.bar(
+        hourly_counts,
+        x="timestamp",
+        y="trades",
+        title="Trades Per Hour",
+        color="trades",
+        range_color=[0, max_per_hour],
+        color_continuous_scale="RdYlGn_r",
+        range_y=[0, chart_ceiling],
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+def make_bias_summary(n_trades: int, loss_ratio: float, peak_hour: str,
+                      avg_win: float, avg_loss: float, verdicts: tuple,
+                      revenge_count: int) -> str:
+    """
+    Plain-text bias report handed to the AI coach as context.
+    `verdicts` is ((flagged, reasons), ...) for overtrading, loss aversion and
+    revenge trading — a hashable projection of the run_all result.
+    """
+    (ot_flag, ot_reasons), (la_flag, la_reasons), (rt_flag, rt_reasons) = verdicts
+    return f"""
+    Trading Analysis Summary:
+    - Total Trades: {n_trades}
+    - Loss/Win Ratio: {loss_ratio:.2f}x
+    - Peak Trading Hour: {peak_hour}
+    - Average Win: ${avg_win:.2f}, Average Loss: ${avg_loss:.2f}
+
+    Overtrading: {"DETECTED" if ot_flag else "CLEAR"}
+    Reasons: {"; ".join(ot_reasons) if ot_reasons else "None"}
+
+    Loss Aversion: {"DETECTED" if la_flag else "CLEAR"}
+    Reasons: {"; ".join(la_reasons) if la_reasons else "None"}
+
+    Revenge Trading: {"DETECTED" if rt_flag else "CLEAR"}
+    Reasons: {"; ".join(rt_reasons) if rt_reasons else "None"}
+    Revenge trade count: {revenge_count}
+    """
+
+
 # ─────────────────────────────────────────────────────────────
 # LOAD & CACHE DATA (runs regardless of page)
 # ─────────────────────────────────────────────────────────────
 if uploaded_files:
     file_fingerprint = [(f.name, f.size) for f in uploaded_files]
     if st.session_state.get("file_fingerprint") != file_fingerprint:
-        dfs    = [pd.read_csv(f) for f in uploaded_files]
-        df_raw = pd.concat(dfs, ignore_index=True)
-        df_raw["timestamp"] = pd.to_datetime(df_raw["timestamp"])
-        df_raw = df_raw.sort_values("timestamp").reset_index(drop=True)
-        st.session_state["df"]               = df_raw
+        st.session_state["df"]               = load_trades(tuple(f.getvalue() for f in uploaded_files))
         st.session_state["file_fingerprint"] = file_fingerprint
 
 # ─────────────────────────────────────────────────────────────
@@ -142,7 +246,7 @@ if page == "📊 Dashboard":
 
     df = st.session_state["df"]
 
-    biases = run_all(
+    biases = cached_run_all(
         df,
         max_per_hour     = int(max_per_hour),
         max_vol_ratio    = float(max_vol_ratio),
@@ -154,10 +258,17 @@ if page == "📊 Dashboard":
     la = biases["loss_aversion"]
     rt = biases["revenge_trading"]
 
-    avg_win    = df[df["profit_loss"] > 0]["profit_loss"].mean() if (df["profit_loss"] > 0).any() else 0
-    avg_loss   = df[df["profit_loss"] < 0]["profit_loss"].abs().mean() if (df["profit_loss"] < 0).any() else 0
-    loss_ratio = round(avg_loss / avg_win, 2) if avg_win > 0 else 0
-    peak_hour  = df.set_index("timestamp").resample("1h").size().idxmax()
+    # Reuse the detectors' aggregates rather than re-scanning / re-resampling df
+    if "avg_win" in la["details"]:
+        avg_win  = la["details"]["avg_win"]
+        avg_loss = la["details"]["avg_loss"]
+    else:
+        # Detector bailed out early (all wins or all losses) — one side is still real
+        pl       = df["profit_loss"].to_numpy(dtype=float)
+        avg_win  = pl[pl > 0].mean() if (pl > 0).any() else 0
+        avg_loss = -pl[pl < 0].mean() if (pl < 0).any() else 0
+    loss_ratio = la["details"].get("loss_win_ratio", 0)
+    peak_hour  = pd.Timestamp(ot["details"]["peak_hour"])
 
     col1, col2, col3, col4, col5 = st.columns(5)
     col1.metric("Total Trades",      len(df))
@@ -169,33 +280,14 @@ if page == "📊 Dashboard":
     col5.metric("Avg Win / Loss",    f"${avg_win:.0f} / ${avg_loss:.0f}")
 
     st.subheader("Performance Timeline")
-    fig_balance = px.line(df, x="timestamp", y="balance", title="Account Balance Over Time")
-    fig_balance.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)")
-    st.plotly_chart(fig_balance, use_container_width=True)
+    st.plotly_chart(balance_figure(df), use_container_width=True)
 
     c1, c2 = st.columns(2)
     with c1:
-        colors  = ["green" if v >= 0 else "red" for v in df["profit_loss"]]
-        fig_pnl = go.Figure(go.Bar(x=df["timestamp"], y=df["profit_loss"], marker_color=colors))
-        fig_pnl.update_layout(title="P/L Per Trade", xaxis_title="Time", yaxis_title="P/L")
-        st.plotly_chart(fig_pnl, use_container_width=True)
+        st.plotly_chart(pnl_figure(df), use_container_width=True)
 
     with c2:
-        hourly_counts = df.set_index("timestamp").resample("1h").size().reset_index(name="trades")
-        current_max   = hourly_counts["trades"].max()
-        chart_ceiling = max(current_max, int(max_per_hour), 100)
-
-        fig_hourly = px.bar(
-            hourly_counts,
-            x="timestamp",
-            y="trades",
-            title="Trades Per Hour",
-            color="trades",
-            range_color=[0, int(max_per_hour)],
-            color_continuous_scale="RdYlGn_r",
-            range_y=[0, chart_ceiling],
-        )
-        st.plotly_chart(fig_hourly, use_container_width=True)
+        st.plotly_chart(hourly_figure(df, int(max_per_hour)), use_container_width=True)
 
     st.divider()
     st.subheader("🔍 Bias Detection Results")
@@ -227,25 +319,7 @@ if page == "📊 Dashboard":
 
     if rt["flagged_trades"]:
         st.markdown("**Flagged Revenge Trades:**")
-        st.dataframe(pd.DataFrame(rt["flagged_trades"]), use_container_width=True)
-
-    bias_summary = f"""
-    Trading Analysis Summary:
-    - Total Trades: {len(df)}
-    - Loss/Win Ratio: {loss_ratio:.2f}x
-    - Peak Trading Hour: {peak_hour.strftime("%H:%M")}
-    - Average Win: ${avg_win:.2f}, Average Loss: ${avg_loss:.2f}
-
-    Overtrading: {"DETECTED" if ot["flagged"] else "CLEAR"}
-    Reasons: {"; ".join(ot["reasons"]) if ot["reasons"] else "None"}
-
-    Loss Aversion: {"DETECTED" if la["flagged"] else "CLEAR"}
-    Reasons: {"; ".join(la["reasons"]) if la["reasons"] else "None"}
-
-    Revenge Trading: {"DETECTED" if rt["flagged"] else "CLEAR"}
-    Reasons: {"; ".join(rt["reasons"]) if rt["reasons"] else "None"}
-    Revenge trade count: {rt["details"].get("revenge_trade_count", 0)}
-    """
+        st.dataframe(rt["flagged_trades_arrow"], use_container_width=True)
 
     st.divider()
     st.subheader("💬 AI Trading Coach")
@@ -262,11 +336,14 @@ if page == "📊 Dashboard":
         with st.chat_message("user"):
             st.markdown(prompt)
 
-        with st.spinner("Coach is thinking..."):
-            full_response = get_chatbot_response(bias_summary, prompt)
-
+        bias_summary = make_bias_summary(
+            len(df), float(loss_ratio), peak_hour.strftime("%H:%M"),
+            float(avg_win), float(avg_loss),
+            tuple((b["flagged"], tuple(b["reasons"])) for b in (ot, la, rt)),
+            rt["details"].get("revenge_trade_count", 0),
+        )
         with st.chat_message("assistant"):
-            st.markdown(full_response)
+            full_response = st.write_stream(stream_chatbot_response(bias_summary, prompt))
 
         st.session_state.messages.append({"role": "assistant", "content": full_response})
 
@@ -282,7 +359,7 @@ elif page == "📋 Feedback & Recommendations":
 
     df = st.session_state["df"]
 
-    biases = run_all(
+    biases = cached_run_all(
         df,
         max_per_hour     = int(max_per_hour),
         max_vol_ratio    = float(max_vol_ratio),
@@ -307,8 +384,12 @@ elif page == "📋 Feedback & Recommendations":
     avg_hourly   = len(df) / total_hours
     revenge_count = rt["details"].get("revenge_trade_count", 0)
 
-    hourly        = df.set_index("timestamp").resample("1h").size()
-    peak_hour_val = int(hourly.max()) if not hourly.empty else 0
+    # Calendar fields pulled out once and shared by the heatmap, timeline and expanders
+    ts        = df["timestamp"]
+    hours_arr = ts.dt.hour.to_numpy()
+    dow_arr   = ts.dt.dayofweek.to_numpy()
+
+    peak_hour_val = ot["details"].get("peak_trades_in_hour", 0)
 
     # Severity scores 0-100
     ot_score      = min(100, (peak_hour_val / max(avg_hourly * 2, 1)) * 50) if ot["flagged"] else 10
@@ -435,7 +516,7 @@ elif page == "📋 Feedback & Recommendations":
     with st.container(border=True):
         st.markdown("#### 🔄 Overtrading")
         if ot["flagged"]:
-            peak_dt = hourly.idxmax()
+            peak_dt = pd.Timestamp(ot["details"]["peak_hour"])
             st.error(
                 f"**You are overtrading.** Your peak hour hit **{peak_hour_val} trades** — "
                 f"above your personalised threshold. You average **{avg_hourly:.1f} trades/hour**, "
@@ -477,7 +558,7 @@ elif page == "📋 Feedback & Recommendations":
                 icon="🚨",
             )
             if rt.get("flagged_trades"):
-                st.dataframe(pd.DataFrame(rt["flagged_trades"]), use_container_width=True, hide_index=True)
+                st.dataframe(rt["flagged_trades_arrow"], use_container_width=True, hide_index=True)
         else:
             st.success("**Revenge Trading: Clear.** No oversized positions detected immediately after losses.", icon="✅")
 
@@ -490,13 +571,9 @@ elif page == "📋 Feedback & Recommendations":
 
     with tab_heat:
         st.markdown("**Trade frequency heatmap — Day of week vs Hour of day**")
-        df2 = df.copy()
-        df2["dow"]  = df2["timestamp"].dt.day_name()
-        df2["hour"] = df2["timestamp"].dt.hour
-        pivot = df2.groupby(["dow", "hour"]).size().reset_index(name="count")
-        days_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        pivot["dow"] = pd.Categorical(pivot["dow"], categories=days_order, ordered=True)
-        heat_matrix = pivot.pivot_table(index="dow", columns="hour", values="count", fill_value=0)
+        days_order  = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+        heat_matrix = df.groupby([dow_arr, hours_arr]).size().unstack(fill_value=0)
+        heat_matrix.index = [days_order[d] for d in heat_matrix.index]
         fig_heat = px.imshow(
             heat_matrix, labels=dict(x="Hour of Day", y="Day of Week", color="Trades"),
             color_continuous_scale="YlOrRd", aspect="auto", title="Trading Activity Heatmap",
@@ -507,28 +584,23 @@ elif page == "📋 Feedback & Recommendations":
         st.caption("🔴 Red clusters = high-frequency windows — cross-reference with your P/L to see if activity correlates with worse outcomes.")
 
     with tab_time:
-        df_t = df.copy().reset_index(drop=True)
-        df_t["cumulative_pl"] = df_t["profit_loss"].cumsum()
-        df_t["trade_num"]     = range(1, len(df_t) + 1)
+        cum_pl    = np.nancumsum(df["profit_loss"].to_numpy(dtype=float))
+        trade_num = np.arange(1, len(df) + 1)
 
         fig_cum = go.Figure()
         fig_cum.add_trace(go.Scatter(
-            x=df_t["trade_num"], y=df_t["cumulative_pl"],
+            x=trade_num, y=cum_pl,
             mode="lines", name="Cumulative P/L",
             line=dict(color="#3b82f6", width=2),
             fill="tozeroy", fillcolor="rgba(59,130,246,0.1)",
         ))
         if rt.get("flagged_trades"):
-            ft = pd.DataFrame(rt["flagged_trades"])
-            if "timestamp" in ft.columns:
-                ft["timestamp"] = pd.to_datetime(ft["timestamp"])
-                merged = df_t.merge(ft[["timestamp"]], on="timestamp", how="inner")
-                if not merged.empty:
-                    fig_cum.add_trace(go.Scatter(
-                        x=merged["trade_num"], y=merged["cumulative_pl"],
-                        mode="markers", name="Revenge Trade",
-                        marker=dict(color="#ef4444", size=12, symbol="x"),
-                    ))
+            rev_idx = np.asarray([t["trade_idx"] for t in rt["flagged_trades"]])
+            fig_cum.add_trace(go.Scatter(
+                x=trade_num[rev_idx], y=cum_pl[rev_idx],
+                mode="markers", name="Revenge Trade",
+                marker=dict(color="#ef4444", size=12, symbol="x"),
+            ))
         fig_cum.update_layout(
             title="Cumulative P/L (trade-by-trade)", xaxis_title="Trade Number",
             yaxis_title="Cumulative P/L ($)", paper_bgcolor="rgba(0,0,0,0)",
@@ -536,9 +608,8 @@ elif page == "📋 Feedback & Recommendations":
         )
         st.plotly_chart(fig_cum, use_container_width=True)
 
-        df_t["hour"] = df_t["timestamp"].dt.hour
-        hourly_pl    = df_t.groupby("hour")["profit_loss"].mean().reset_index()
-        hourly_pl["color"] = hourly_pl["profit_loss"].apply(lambda x: "#22c55e" if x >= 0 else "#ef4444")
+        hourly_pl = df["profit_loss"].groupby(hours_arr).mean().rename_axis("hour").reset_index()
+        hourly_pl["color"] = np.where(hourly_pl["profit_loss"].to_numpy() >= 0, "#22c55e", "#ef4444")
         fig_hr = go.Figure(go.Bar(x=hourly_pl["hour"], y=hourly_pl["profit_loss"],
                                   marker_color=hourly_pl["color"], name="Avg P/L per Hour"))
         fig_hr.add_hline(y=0, line_dash="dot", line_color="gray")
@@ -548,14 +619,14 @@ elif page == "📋 Feedback & Recommendations":
         st.plotly_chart(fig_hr, use_container_width=True)
 
     with tab_drawdown:
-        df_d = df.copy()
-        df_d["peak"]     = df_d["balance"].cummax()
-        df_d["drawdown"] = (df_d["balance"] - df_d["peak"]) / df_d["peak"] * 100
-        max_dd = df_d["drawdown"].min()
+        balance  = df["balance"].to_numpy(dtype=float)
+        peak     = np.fmax.accumulate(balance)
+        drawdown = np.divide(balance - peak, peak, out=np.zeros_like(balance), where=peak != 0) * 100
+        max_dd   = np.nanmin(drawdown)
 
         fig_dd = go.Figure()
         fig_dd.add_trace(go.Scatter(
-            x=df_d["timestamp"], y=df_d["drawdown"],
+            x=df["timestamp"], y=drawdown,
             fill="tozeroy", fillcolor="rgba(239,68,68,0.18)",
             line=dict(color="#ef4444"), name="Drawdown %",
         ))
@@ -652,10 +723,8 @@ elif page == "📋 Feedback & Recommendations":
 
     with st.expander("⏱️ Frequency Control", expanded=ot["flagged"]):
         best_hours = []
-        if not hourly.empty:
-            df_t3 = df.copy()
-            df_t3["hour"] = df_t3["timestamp"].dt.hour
-            hour_pl = df_t3.groupby("hour")["profit_loss"].mean()
+        if not df.empty:
+            hour_pl = df["profit_loss"].groupby(hours_arr).mean()
             best_hours = hour_pl.nlargest(3).index.tolist()
         st.markdown(f"""
         <div class="insight-box">
@@ -867,8 +936,9 @@ elif page == "📚 Learning Centre":
             st.info("Three independent sub-checks run in parallel — **any one** can flag the bias.", icon="ℹ️")
             with st.expander("📊 Sub-check A — Trades per hour", expanded=True):
                 st.code("""
-hourly   = df.set_index("timestamp").resample("1h").size()
-peak_val = int(hourly.max())
+hours            = df["timestamp"].to_numpy().astype("datetime64[h]")
+buckets, counts  = np.unique(hours, return_counts=True)
+peak_val         = int(counts.max())
 total_hours  = (df["timestamp"].max() - df["timestamp"].min()).total_seconds() / 3600
 avg_hourly   = len(df) / total_hours
 max_per_hour = max(int(avg_hourly * 2), 15)
@@ -878,21 +948,26 @@ if peak_val > max_per_hour:
                 """, language="python")
             with st.expander("📊 Sub-check B — Volume / balance ratio"):
                 st.code("""
-df["trade_value"] = df["quantity"] * df["entry_price"]
-ratio = df["trade_value"].sum() / df["balance"].mean()
+total_vol = (df["quantity"] * df["entry_price"]).sum()
+ratio     = total_vol / df["balance"].mean()
 if ratio > max_vol_ratio:
     result["flagged"] = True
     result["reasons"].append(f"Total volume is {ratio:.1f}× your average balance")
                 """, language="python")
             with st.expander("📊 Sub-check C — Rapid position switching"):
                 st.code("""
-switches = 0
-for asset in df["asset"].unique():
-    sub = df[df["asset"] == asset].reset_index(drop=True)
-    for i in range(1, len(sub)):
-        diff_min = (sub.loc[i,"timestamp"] - sub.loc[i-1,"timestamp"]).total_seconds()/60
-        if sub.loc[i,"buy_sell"] != sub.loc[i-1,"buy_sell"] and diff_min < 30:
-            switches += 1
+asset_code = pd.factorize(df["asset"])[0]
+side_code  = pd.factorize(df["buy_sell"])[0]
+ts_ns      = df["timestamp"].to_numpy().astype("datetime64[ns]").view("i8")
+
+# _count_switches: group by asset (stable sort keeps time order), then
+# compare each trade with the previous one via shifted slices
+order      = np.argsort(asset_code, kind="stable")
+asset, side, ts = asset_code[order], side_code[order], ts_ns[order]
+same_asset = (asset[1:] == asset[:-1]) & (asset[1:] >= 0)          # -1 = missing asset
+flipped    = (side[1:] != side[:-1]) | (side[1:] < 0) | (side[:-1] < 0)
+in_window  = (ts[1:] - ts[:-1]) < 30 * 60e9     # 30 minutes in ns
+switches   = int(np.count_nonzero(same_asset & flipped & in_window))
 if switches >= 3:
     result["flagged"] = True
     result["reasons"].append(f"Detected {switches} rapid position switches")
@@ -1054,7 +1129,7 @@ flagged_df = df[mask]
              "Too many / too large trades",
              "FOMO, boredom, action bias, dopamine loops",
              "`timestamp` `quantity` `balance` `buy_sell` `asset`",
-             "`resample('1h')`, volume ratio, position-switch loop",
+             "hourly `datetime64[h]` buckets, volume ratio, `factorize` + stable `argsort` position switches",
              "2× your avg hourly rate, or volume >3× balance",
              "Hard daily trade limit + pre-trade checklist"),
             ("col2", "😰 Loss Aversion", "#c62828",
@@ -1098,7 +1173,7 @@ flagged_df = df[mask]
             {"q": "A trader executes 18 trades in a single hour. Which bias does this most directly indicate?",
              "options": ["Loss Aversion", "Revenge Trading", "Overtrading", "Anchoring Bias"],
              "answer": "Overtrading",
-             "explanation": "Time-based clustering — too many trades in a single hour — is the primary signal of **Overtrading**. Our engine flags this using `resample('1h')`."},
+             "explanation": "Time-based clustering — too many trades in a single hour — is the primary signal of **Overtrading**. Our engine flags this by counting trades per hourly bucket."},
             {"q": "Sarah's average winning trade returns $90, but her average losing trade costs her $220. What is her loss/win ratio and what does it indicate?",
              "options": ["0.41× — she is managing risk well", "2.44× — she likely has Loss Aversion", "1.0× — perfectly balanced", "2.44× — she likely has Revenge Trading tendencies"],
              "answer": "2.44× — she likely has Loss Aversion",
@@ -9,6 +9,8 @@ All three detectors return a consistent dict:
         "details": dict,
         "flagged_trades": list[dict]   # only for revenge trading
     }
+Revenge trading additionally carries "flagged_trades_arrow", the same
+rows (minus the internal trade_idx) as a pyarrow.Table ready for st.dataframe.
 
 Expected DataFrame columns (case-sensitive):
     timestamp, buy_sell, asset, quantity,
@@ -17,6 +19,7 @@ Expected DataFrame columns (case-sensitive):
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 
 
 # ─────────────────────────────────────────────────────────────
@@ -34,6 +37,82 @@ DEFAULT_REVENGE_QTY_MULT      = 1.5    # flag if qty after loss > avg_qty * this
 DEFAULT_REVENGE_TIME_MIN      = 15     # minutes; window after a loss to look for revenge trade
 
 
+# ─────────────────────────────────────────────────────────────
+# INTERNAL KERNELS
+# ─────────────────────────────────────────────────────────────
+def _count_switches(
+    ts_ns: np.ndarray,
+    side_code: np.ndarray,
+    asset_code: np.ndarray,
+    window_ns: int,
+) -> int:
+    """
+    Count consecutive same-asset trades that flip side within `window_ns`.
+    Inputs are time-sorted int arrays; code -1 marks a missing asset/side,
+    and NaT timestamps must already be masked out via asset_code = -1.
+    """
+    order = np.argsort(asset_code, kind="stable")   # group by asset, keep time order
+    asset = asset_code[order]
+    side  = side_code[order]
+    ts    = ts_ns[order]
+
+    same_asset = (asset[1:] == asset[:-1]) & (asset[1:] >= 0)
+    flipped    = (side[1:] != side[:-1]) | (side[1:] < 0) | (side[:-1] < 0)
+    in_window  = (ts[1:] - ts[:-1]) < window_ns
+    return int(np.count_nonzero(same_asset & flipped & in_window))
+
+
+def _ensure_datetime(df: pd.DataFrame) -> pd.DataFrame:
+    """Parse `timestamp` only if the caller has not already done so."""
+    if pd.api.types.is_datetime64_any_dtype(df["timestamp"]):
+        return df
+    return df.assign(timestamp=pd.to_datetime(df["timestamp"]))
+
+
+def _prepare_trades(df: pd.DataFrame) -> pd.DataFrame:
+    """Return `df` with parsed timestamps in chronological (stable) order."""
+    df = _ensure_datetime(df)
+    if not df["timestamp"].is_monotonic_increasing:
+        df = df.sort_values("timestamp", kind="stable", ignore_index=True)
+    return df
+
+
+def _revenge_mask(
+    pl: np.ndarray,
+    qty: np.ndarray,
+    ts_ns: np.ndarray,
+    ts_nat: np.ndarray,
+    qty_limit: float,
+    window_ns: float,
+) -> np.ndarray:
+    """
+    Mark trades that follow a loss, exceed `qty_limit` and open within
+    `window_ns` of the previous trade. The three conditions are combined
+    in place on one bool buffer over the shifted array slices.
+    """
+    mask = np.zeros(len(pl), dtype=bool)
+    if len(pl) < 2:
+        return mask
+    hit = pl[:-1] < 0
+    hit &= qty[1:] > qty_limit
+    hit &= (ts_ns[1:] - ts_ns[:-1]) <= window_ns
+    hit &= ~(ts_nat[1:] | ts_nat[:-1])
+    mask[1:] = hit
+    return mask
+
+
+def _summary_stats(df: pd.DataFrame) -> dict:
+    """Column reductions used by the detectors, computed once per run."""
+    stats = {}
+    if "quantity" in df.columns:
+        stats["avg_qty"] = df["quantity"].mean()
+        if "entry_price" in df.columns:
+            stats["total_vol"] = (df["quantity"] * df["entry_price"]).sum()
+    if "balance" in df.columns:
+        stats["avg_balance"] = df["balance"].mean()
+    return stats
+
+
 # ─────────────────────────────────────────────────────────────
 # 1. OVERTRADING DETECTION
 # ─────────────────────────────────────────────────────────────
@@ -43,23 +122,27 @@ def detect_overtrading(
     max_vol_ratio: float = DEFAULT_VOL_BALANCE_RATIO,
     switch_window_min: int = DEFAULT_SWITCH_WINDOW_MIN,
     min_switches: int   = DEFAULT_MIN_SWITCHES,
+    stats: dict = None,
 ) -> dict:
     """
     Detects overtrading via three sub-checks:
       A) Time-based clustering  — too many trades in one hour
       B) Volume-to-balance ratio — total notional far exceeds account size
       C) Rapid position switching — alternating buy/sell same asset in short window
+    `stats` may carry precomputed column aggregates (see run_all).
     """
     result = {"flagged": False, "reasons": [], "details": {}, "flagged_trades": []}
+    stats  = _summary_stats(df) if stats is None else stats
 
-    df = df.copy()
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
-    df = df.sort_values("timestamp").reset_index(drop=True)
+    df = _prepare_trades(df)
 
     # ── A: Time-based clustering ──────────────────────────────
-    hourly = df.set_index("timestamp").resample("1h").size()
-    peak_val  = int(hourly.max())
-    peak_hour = hourly.idxmax()
+    # Truncate to the hour and count per bucket — no index build or resample bins
+    hours = df["timestamp"].to_numpy().astype("datetime64[h]")
+    buckets, counts = np.unique(hours[~np.isnat(hours)], return_counts=True)
+    peak_idx  = counts.argmax()
+    peak_val  = int(counts[peak_idx])
+    peak_hour = pd.Timestamp(buckets[peak_idx])
 
     result["details"]["peak_trades_in_hour"] = peak_val
     result["details"]["peak_hour"] = str(peak_hour)
@@ -73,9 +156,8 @@ def detect_overtrading(
 
     # ── B: Volume-to-balance ratio ────────────────────────────
     if "entry_price" in df.columns and "quantity" in df.columns:
-        df["trade_value"] = df["quantity"] * df["entry_price"]
-        total_vol   = df["trade_value"].sum()
-        avg_balance = df["balance"].mean() if "balance" in df.columns and df["balance"].mean() != 0 else 1
+        total_vol   = stats["total_vol"]
+        avg_balance = stats.get("avg_balance", 0) or 1
         ratio = round(total_vol / avg_balance, 2)
 
         result["details"]["volume_balance_ratio"] = ratio
@@ -89,13 +171,13 @@ def detect_overtrading(
 
     # ── C: Rapid position switching ───────────────────────────
     if "asset" in df.columns and "buy_sell" in df.columns:
-        switches = 0
-        for asset in df["asset"].unique():
-            sub = df[df["asset"] == asset].reset_index(drop=True)
-            for i in range(1, len(sub)):
-                diff_min = (sub.loc[i, "timestamp"] - sub.loc[i-1, "timestamp"]).total_seconds() / 60
-                if sub.loc[i, "buy_sell"] != sub.loc[i-1, "buy_sell"] and diff_min < switch_window_min:
-                    switches += 1
+        # Integer-encode the columns and compare each trade with the previous
+        # trade on the same asset in a single array pass (df is time-sorted)
+        asset_code = pd.factorize(df["asset"])[0]
+        side_code  = pd.factorize(df["buy_sell"])[0]
+        asset_code[df["timestamp"].isna().to_numpy()] = -1
+        ts_ns      = df["timestamp"].to_numpy().astype("datetime64[ns]").view("i8")
+        switches   = _count_switches(ts_ns, side_code, asset_code, int(switch_window_min * 60e9))
 
         result["details"]["rapid_position_switches"] = switches
 
@@ -124,22 +206,26 @@ def detect_loss_aversion(
     """
     result = {"flagged": False, "reasons": [], "details": {}, "flagged_trades": []}
 
-    winners = df[df["profit_loss"] > 0]["profit_loss"]
-    losers  = df[df["profit_loss"] < 0]["profit_loss"].abs()
+    # Build the win/loss masks once and reuse them for both sub-checks
+    pl        = df["profit_loss"].to_numpy()
+    win_mask  = pl > 0
+    loss_mask = pl < 0
+    n_winners = int(win_mask.sum())
+    n_losers  = int(loss_mask.sum())
 
-    if winners.empty or losers.empty:
+    if n_winners == 0 or n_losers == 0:
         result["details"]["note"] = "Insufficient data — need both wins and losses."
         return result
 
-    avg_win  = round(winners.mean(), 2)
-    avg_loss = round(losers.mean(), 2)
+    avg_win  = round(pl[win_mask].mean(), 2)
+    avg_loss = round(-pl[loss_mask].mean(), 2)
     ratio    = round(avg_loss / avg_win, 2) if avg_win > 0 else 0
 
     result["details"]["avg_win"]        = avg_win
     result["details"]["avg_loss"]       = avg_loss
     result["details"]["loss_win_ratio"] = ratio
-    result["details"]["total_winners"]  = int(len(winners))
-    result["details"]["total_losers"]   = int(len(losers))
+    result["details"]["total_winners"]  = n_winners
+    result["details"]["total_losers"]   = n_losers
 
     # ── A: P/L size ratio ─────────────────────────────────────
     if ratio > ratio_threshold:
@@ -151,11 +237,10 @@ def detect_loss_aversion(
 
     # ── B: Price range asymmetry ──────────────────────────────
     if "entry_price" in df.columns and "exit_price" in df.columns:
-        df2 = df.copy()
-        df2["price_range"] = (df2["exit_price"] - df2["entry_price"]).abs()
+        price_range = np.abs(df["exit_price"].to_numpy() - df["entry_price"].to_numpy())
 
-        avg_range_win  = round(df2[df2["profit_loss"] > 0]["price_range"].mean(), 2)
-        avg_range_loss = round(df2[df2["profit_loss"] < 0]["price_range"].mean(), 2)
+        avg_range_win  = round(np.nanmean(price_range[win_mask]), 2)
+        avg_range_loss = round(np.nanmean(price_range[loss_mask]), 2)
         range_ratio    = round(avg_range_loss / avg_range_win, 2) if avg_range_win > 0 else 0
 
         result["details"]["avg_price_move_winners"] = avg_range_win
@@ -180,50 +265,59 @@ def detect_revenge_trading(
     df: pd.DataFrame,
     qty_multiplier: float = DEFAULT_REVENGE_QTY_MULT,
     time_window_min: int  = DEFAULT_REVENGE_TIME_MIN,
+    stats: dict = None,
 ) -> dict:
     """
     Detects revenge trading:
       After any losing trade, checks the NEXT trade for:
         • Quantity significantly above the trader's historical average  AND/OR
         • Opened within `time_window_min` minutes of the loss
+    Each flagged trade carries `trade_idx`, its 0-based position in the
+    time-sorted trades.
+    `stats` may carry precomputed column aggregates (see run_all).
     """
     result = {"flagged": False, "reasons": [], "details": {}, "flagged_trades": []}
 
-    df = df.copy().sort_values("timestamp").reset_index(drop=True)
-
     if "quantity" not in df.columns:
         result["details"]["note"] = "No 'quantity' column — cannot detect revenge trading."
         return result
 
-    avg_qty = df["quantity"].mean()
-    result["details"]["average_quantity"] = round(float(avg_qty), 4)
+    df = _prepare_trades(df)
 
-    # Use .shift() to align each row with the previous trade's P/L and timestamp
-    df["prev_pl"]       = df["profit_loss"].shift(1)
-    df["prev_ts"]       = df["timestamp"].shift(1)
-    df["time_since_prev"] = (df["timestamp"] - df["prev_ts"]).dt.total_seconds() / 60
+    stats   = _summary_stats(df) if stats is None else stats
+    avg_qty = stats["avg_qty"]
+    result["details"]["average_quantity"] = round(float(avg_qty), 4)
 
     # A trade is flagged as revenge if:
     #   • The preceding trade was a loss (prev_pl < 0)
     #   • AND current quantity > avg_qty * multiplier
     #   • AND it was opened within the time window
-    mask = (
-        (df["prev_pl"] < 0) &
-        (df["quantity"] > avg_qty * qty_multiplier) &
-        (df["time_since_prev"] <= time_window_min)
+    pl    = df["profit_loss"].to_numpy(dtype=float)
+    ts    = df["timestamp"].to_numpy().astype("datetime64[ns]")
+    ts_ns = ts.view("i8")
+    mask  = _revenge_mask(
+        pl, df["quantity"].to_numpy(dtype=float), ts_ns, np.isnat(ts),
+        avg_qty * qty_multiplier, time_window_min * 60e9,
     )
-    flagged_df = df[mask]
-
-    for _, row in flagged_df.iterrows():
-        result["flagged_trades"].append({
-            "timestamp":      str(row["timestamp"]),
-            "asset":          row.get("asset", "N/A"),
-            "quantity":       round(float(row["quantity"]), 4),
-            "avg_quantity":   round(float(avg_qty), 4),
-            "size_vs_avg":    f"{row['quantity']/avg_qty:.1f}x",
-            "prev_loss":      round(float(row["prev_pl"]), 2),
-            "mins_after_loss": round(float(row["time_since_prev"]), 1),
-        })
+    idx        = np.flatnonzero(mask)
+    flagged_df = df.iloc[idx]
+    prev_pl         = pl[idx - 1]
+    time_since_prev = (ts_ns[idx] - ts_ns[idx - 1]) * (1.0 / 60e9)   # ns → minutes
+
+    # Build the output columns once, then materialise the rows in a single call
+    flagged = pd.DataFrame({
+        "trade_idx":       idx,
+        "timestamp":       flagged_df["timestamp"].astype(str),
+        "asset":           flagged_df["asset"] if "asset" in flagged_df.columns else "N/A",
+        "quantity":        flagged_df["quantity"].astype(float).round(4),
+        "avg_quantity":    round(float(avg_qty), 4),
+        "size_vs_avg":     (flagged_df["quantity"] / avg_qty).map("{:.1f}x".format),
+        "prev_loss":       prev_pl.round(2),
+        "mins_after_loss": time_since_prev.round(1),
+    })
+    result["flagged_trades"]       = flagged.to_dict("records")
+    # trade_idx is an internal row position for chart markers — keep it off the tables
+    result["flagged_trades_arrow"] = pa.Table.from_pandas(flagged.drop(columns="trade_idx"), preserve_index=False)
 
     count = len(result["flagged_trades"])
     result["details"]["revenge_trade_count"] = count
@@ -251,9 +345,15 @@ def run_all(
     revenge_mult:     float = DEFAULT_REVENGE_QTY_MULT,
     revenge_time_min: int   = DEFAULT_REVENGE_TIME_MIN,
 ) -> dict:
-    """Run all three detectors and return a combined dict."""
+    """
+    Run all three detectors and return a combined dict.
+    Timestamps are parsed and sorted once here, and the shared column
+    aggregates computed once, so the detectors skip that work.
+    """
+    df    = _prepare_trades(df)
+    stats = _summary_stats(df)
     return {
-        "overtrading":    detect_overtrading(df,  max_per_hour=max_per_hour,  max_vol_ratio=max_vol_ratio),
+        "overtrading":    detect_overtrading(df,  max_per_hour=max_per_hour,  max_vol_ratio=max_vol_ratio, stats=stats),
         "loss_aversion":  detect_loss_aversion(df, ratio_threshold=loss_win_ratio),
-        "revenge_trading": detect_revenge_trading(df, qty_multiplier=revenge_mult, time_window_min=revenge_time_min),
+        "revenge_trading": detect_revenge_trading(df, qty_multiplier=revenge_mult, time_window_min=revenge_time_min, stats=stats),
     }
\ No newline at end of file
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+PLOT_MAX_POINTS = 2000   # line charts are LTTB-downsampled above this
+# Bounds for the per-upload st.cache_* helpers: the caches are process-wide, so
+# every session's upload × threshold combination would otherwise stay resident
+CACHE_MAX_ENTRIES = 32
+CACHE_TTL         = "1h"
+
+
+def hash_df(d: pd.DataFrame) -> int:
+    """Content hash of a trades frame, for st.cache_* hash_funcs shared across sessions."""
+    return hash(pd.util.hash_pandas_object(d).values.tobytes())
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of `n_out` points preserving the line shape."""
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    x = x.astype(float)
+    y = y.astype(float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx   = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi   = edges[i], edges[i + 1]
+        nxt_hi   = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x    = x[hi:nxt_hi].mean()
+        avg_y    = y[hi:nxt_hi].mean()
+        area     = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a        = lo + int(area.argmax())
+        idx[i + 1] = a
+    return idx
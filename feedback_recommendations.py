@@ -11,70 +11,49 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 import numpy as np
-from datetime import datetime, timedelta
+import pyarrow as pa
+from datetime import date, timedelta
+from functools import lru_cache
+from itertools import combinations
+
+from downsample import CACHE_MAX_ENTRIES, CACHE_TTL, PLOT_MAX_POINTS, hash_df, lttb
+
+JOURNAL_COLS    = ["date", "mood", "plan", "debrief", "biases", "lesson"]
+JOURNAL_PAGE    = 20     # journal table shows this many latest entries by default
+# Form option sets as immutable tuples, shared by every rerun
+MOOD_OPTIONS    = ("Very Calm", "Calm", "Neutral", "Anxious", "Very Anxious")
+BIAS_OPTIONS    = ("Overtrading", "Loss Aversion", "Revenge Trading", "FOMO", "None")
+MOOD_CATS       = pd.CategoricalDtype(list(MOOD_OPTIONS), ordered=True)
+# Every possible multiselect subset → its display string (32 entries), looked up on save
+BIAS_JOIN       = {
+    frozenset(c): ", ".join(c) or "None"
+    for r in range(len(BIAS_OPTIONS) + 1) for c in combinations(BIAS_OPTIONS, r)
+}
+BIAS_CATS       = pd.CategoricalDtype(list(dict.fromkeys(BIAS_JOIN.values())))
+# Arrow-backed strings: st.dataframe hands the buffers over without per-cell conversion;
+# mood and biases are dictionary-encoded (small int codes + the label set); date is a
+# native date32 column (4 bytes/row) rendered by the front-end's date formatter
+JOURNAL_DTYPES  = {
+    **{c: "string[pyarrow]" for c in JOURNAL_COLS},
+    "date": pd.ArrowDtype(pa.date32()), "mood": MOOD_CATS, "biases": BIAS_CATS,
+}
+# Formatting happens client-side from these configs, so the table never needs a Styler
+JOURNAL_COL_CFG = {
+    "date":    st.column_config.DateColumn("Date", format="YYYY-MM-DD"),
+    "mood":    st.column_config.TextColumn("Mood", width="small"),
+    "plan":    st.column_config.TextColumn("Plan", width="medium"),
+    "debrief": st.column_config.TextColumn("Debrief", width="medium"),
+    "biases":  st.column_config.TextColumn("Biases", width="medium"),
+    "lesson":  st.column_config.TextColumn("Lesson", width="medium"),
+}
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# HELPER — severity badge
-# ─────────────────────────────────────────────────────────────────────────────
-def _severity(score: float) -> tuple[str, str]:
-    """Return (label, hex_colour) for a 0-100 severity score."""
-    if score >= 75:
-        return "🔴 Critical", "#c62828"
-    if score >= 50:
-        return "🟠 Moderate", "#e65100"
-    if score >= 25:
-        return "🟡 Mild", "#f9a825"
-    return "🟢 Clear", "#2e7d32"
-
-
+# STATIC MARKUP — page stylesheet and hero banner
 # ─────────────────────────────────────────────────────────────────────────────
-# MAIN RENDER FUNCTION  — call this from app.py
-# ─────────────────────────────────────────────────────────────────────────────
-def render_feedback_page(df: pd.DataFrame, biases: dict):
-    """
-    Parameters
-    ----------
-    df     : the full cleaned trading DataFrame (columns as per CSV spec)
-    biases : dict returned by bias_engine.run_all()
-    """
-    ot = biases["overtrading"]
-    la = biases["loss_aversion"]
-    rt = biases["revenge_trading"]
-
-    # ── Pre-compute stats used across sections ────────────────────────────────
-    wins   = df[df["profit_loss"] > 0]["profit_loss"]
-    losses = df[df["profit_loss"] < 0]["profit_loss"].abs()
-
-    avg_win    = wins.mean()   if not wins.empty   else 0
-    avg_loss   = losses.mean() if not losses.empty else 0
-    loss_ratio = avg_loss / avg_win if avg_win > 0 else 0
-
-    win_rate = len(wins) / len(df) * 100 if len(df) > 0 else 0
-
-    total_hours = max(
-        (df["timestamp"].max() - df["timestamp"].min()).total_seconds() / 3600, 1
-    )
-    avg_hourly = len(df) / total_hours
-
-    revenge_count = rt["details"].get("revenge_trade_count", 0)
-
-    # Compute per-hour trade counts
-    hourly = df.set_index("timestamp").resample("1h").size()
-    peak_hour_val = int(hourly.max()) if not hourly.empty else 0
-
-    # ── Severity scores (0-100) ───────────────────────────────────────────────
-    ot_score = min(100, (peak_hour_val / max(avg_hourly * 2, 1)) * 50) if ot["flagged"] else 10
-    la_score = min(100, (loss_ratio / 1.5) * 50)                        if la["flagged"] else 10
-    rt_score = min(100, revenge_count * 20)                              if rt["flagged"] else 5
-
-    overall_score = (ot_score + la_score + rt_score) / 3
-
-    # ─────────────────────────────────────────────────────────────────────────
-    # PAGE HEADER
-    # ─────────────────────────────────────────────────────────────────────────
-    st.markdown("""
+_FB_CSS = """
     <style>
     @import url('https://fonts.googleapis.com/css2?family=DM+Serif+Display:ital@0;1&family=DM+Sans:wght@300;400;500;600&display=swap');
 
@@ -156,14 +135,228 @@ def render_feedback_page(df: pd.DataFrame, biases: dict):
         border-bottom: 2px solid #e2e8f0;
     }
     </style>
-    """, unsafe_allow_html=True)
+"""
 
-    st.markdown("""
+_FB_HERO = """
     <div class="fb-hero">
         <h1>📋 Feedback &amp; Recommendations</h1>
         <p>Personalised analysis of your trading psychology — actionable suggestions backed by your own data.</p>
     </div>
-    """, unsafe_allow_html=True)
+"""
+
+_JOURNAL_HEADER_HTML = '<p class="section-head">✍️ Log a Journal Entry</p>'
+_FB_FOOTER = "NBC Bias Detector · Feedback & Recommendations · Educational purposes only — not financial advice."
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HELPER — severity badge
+# ─────────────────────────────────────────────────────────────────────────────
+_THRESH = np.array([25, 50, 75])
+_LABELS = np.array(["🟢 Clear", "🟡 Mild", "🟠 Moderate", "🔴 Critical"])
+_COLORS = np.array(["#2e7d32", "#f9a825", "#e65100", "#c62828"])
+
+
+@lru_cache(maxsize=128)
+def _severity_int(bucket: int) -> tuple[str, str]:
+    idx = int(np.searchsorted(_THRESH, bucket, side="right"))
+    return str(_LABELS[idx]), str(_COLORS[idx])
+
+
+def _severity(score) -> tuple[str, str]:
+    """Return (label, hex_colour) for a 0-100 severity score."""
+    # Thresholds are whole numbers, so flooring keeps the score in its bucket
+    return _severity_int(int(score))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HELPER — cached page statistics
+# ─────────────────────────────────────────────────────────────────────────────
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: hash_df},
+               max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+def _compute_stats(df: pd.DataFrame) -> dict:
+    """All data-derived numbers and frames the page needs, computed once per upload."""
+    wins   = df[df["profit_loss"] > 0]["profit_loss"]
+    losses = df[df["profit_loss"] < 0]["profit_loss"].abs()
+
+    avg_win    = wins.mean()   if not wins.empty   else 0
+    avg_loss   = losses.mean() if not losses.empty else 0
+    loss_ratio = avg_loss / avg_win if avg_win > 0 else 0
+
+    win_rate = len(wins) / len(df) * 100 if len(df) > 0 else 0
+
+    total_hours = max(
+        (df["timestamp"].max() - df["timestamp"].min()).total_seconds() / 3600, 1
+    )
+    avg_hourly = len(df) / total_hours
+
+    # Per-hour trade counts
+    hourly = df.set_index("timestamp").resample("1h").size()
+    peak_hour_val = int(hourly.max()) if not hourly.empty else 0
+    peak_dt       = hourly.idxmax() if not hourly.empty else None
+
+    # Derived per-trade arrays — computed once, no DataFrame copies
+    # Blank timestamps (NaT) are left out of the hour/day bins, like the old groupby
+    valid     = df["timestamp"].notna().to_numpy()
+    hours     = df["timestamp"].dt.hour.to_numpy()[valid].astype(np.int64)
+    dow       = df["timestamp"].dt.dayofweek.to_numpy()[valid].astype(np.int64)
+    trade_num = np.arange(1, len(df) + 1)
+    cum_pl    = np.nancumsum(df["profit_loss"].to_numpy())
+    balance   = df["balance"].to_numpy(dtype=float)
+    peak      = np.fmax.accumulate(balance)
+    drawdown  = np.divide(balance - peak, peak, out=np.zeros_like(balance), where=peak != 0) * 100
+    max_dd    = np.nanmin(drawdown)
+
+    # Line-chart indices: ~PLOT_MAX_POINTS shape-preserving points, not every trade
+    ts_ns    = df["timestamp"].to_numpy().astype("datetime64[ns]").view("i8")
+    cum_keep = lttb(trade_num, cum_pl, PLOT_MAX_POINTS)
+    dd_keep  = lttb(ts_ns, drawdown, PLOT_MAX_POINTS)
+
+    # Day-of-week × hour-of-day trade counts
+    days_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    counts = np.bincount(dow * 24 + hours, minlength=7 * 24).reshape(7, 24)
+    heat_matrix = pd.DataFrame(counts, index=days_order, columns=range(24))
+
+    # Average P/L by hour of day — 24-bin sums / counts, missing P/L skipped
+    pl       = df["profit_loss"].to_numpy(dtype=float)
+    has_pl   = ~np.isnan(pl[valid])
+    hour_cnt = np.bincount(hours[has_pl], minlength=24)
+    hour_sum = np.bincount(hours[has_pl], weights=pl[valid][has_pl], minlength=24)
+    mean_pl  = np.divide(hour_sum, hour_cnt, out=np.full(24, -np.inf), where=hour_cnt > 0)
+    active   = np.flatnonzero(hour_cnt)
+    hourly_pl = pd.DataFrame({"hour": active, "profit_loss": mean_pl[active]})
+    hourly_pl["color"] = np.where(hourly_pl["profit_loss"].to_numpy() >= 0, "#22c55e", "#ef4444")
+
+    # Best-performing hours: top 3 by average P/L, best first
+    top        = np.sort(np.argpartition(-mean_pl, 2)[:3])
+    top        = top[hour_cnt[top] > 0]
+    best_hours = top[np.argsort(-mean_pl[top], kind="stable")].tolist()
+
+    # Trade-size histogram binned server-side: 40 counts + 41 edges, not every trade
+    qty     = df["quantity"].to_numpy(dtype=float)
+    qty     = qty[~np.isnan(qty)]
+    avg_qty = qty.mean() if qty.size else np.nan
+    size_counts, size_edges = np.histogram(qty, bins=40)
+
+    return {
+        "avg_win": avg_win, "avg_loss": avg_loss, "loss_ratio": loss_ratio,
+        "win_rate": win_rate, "avg_hourly": avg_hourly,
+        "peak_hour_val": peak_hour_val, "peak_dt": peak_dt,
+        "heat_matrix": heat_matrix, "trade_num": trade_num, "cum_pl": cum_pl,
+        "hourly_pl": hourly_pl, "drawdown": drawdown, "max_dd": max_dd,
+        "best_hours": best_hours,
+        "cum_keep": cum_keep, "dd_keep": dd_keep,
+        "avg_qty": avg_qty, "outlier_count": np.count_nonzero(qty > avg_qty * 1.5),
+        "size_counts": size_counts, "size_edges": size_edges,
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HELPER — journal table as Arrow (rebuilt only when a row is appended)
+# ─────────────────────────────────────────────────────────────────────────────
+def _journal_arrow(journal: pd.DataFrame) -> pa.Table:
+    """Return the journal as a pyarrow Table, memoised per session on (rows, last row)."""
+    key    = (len(journal), hash(tuple(journal.iloc[-1])) if len(journal) else 0)
+    cached = st.session_state.get("_journal_arrow")
+    if cached is None or cached[0] != key:
+        cached = (key, pa.Table.from_pandas(journal, preserve_index=False))
+        st.session_state["_journal_arrow"] = cached
+    return cached[1]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HELPER — journal entry (fragment: form interactions rerun only this block)
+# ─────────────────────────────────────────────────────────────────────────────
+def _save_entry():
+    """Form on_click: append the submitted widget values to the session journal."""
+    s = st.session_state
+    entry = {
+        "date":     s.j_date,
+        "mood":     s.j_mood,
+        "plan":     s.j_plan,
+        "debrief":  s.j_debrief,
+        "biases":   BIAS_JOIN[frozenset(s.j_bias)],
+        "lesson":   s.j_lesson,
+    }
+    row = pd.DataFrame([entry]).astype(JOURNAL_DTYPES)
+    # Append just the new row; the frame is the session's only copy of the journal
+    s.journal_df = pd.concat([s.journal_df, row], ignore_index=True)
+    s["_journal_saved"] = True
+
+
+@st.fragment
+def _journal_fragment():
+    """Journal form + this session's entries; a save reruns only this fragment."""
+    # Guarded rather than setdefault: building the seed frame eagerly would cost every rerun
+    if "journal_df" not in st.session_state:
+        st.session_state.journal_df = pd.DataFrame(columns=JOURNAL_COLS).astype(JOURNAL_DTYPES)
+
+    with st.form("journal_form"):
+        st.date_input("Session date", value=date.today(), key="j_date")
+        st.select_slider("Emotional state before session", options=MOOD_OPTIONS, value="Neutral", key="j_mood")
+        st.text_area("What was your pre-session plan?", placeholder="E.g. Max 3 trades, only BTC, wait for support level confirmation...", key="j_plan")
+        st.text_area("Post-session debrief", placeholder="What happened? Did you stick to the plan?", key="j_debrief")
+        st.multiselect("Which biases showed up today (self-assessed)?", BIAS_OPTIONS, key="j_bias")
+        st.text_area("One lesson from today", placeholder="e.g. I need to wait 10 min after entry before checking P/L...", key="j_lesson")
+        # Saved in the callback, before the fragment body reruns, so the table already has the row
+        st.form_submit_button("💾 Save Entry", type="primary", on_click=_save_entry)
+
+    # Callbacks can't draw inside a fragment; confirm the save from the body instead
+    if st.session_state.pop("_journal_saved", False):
+        st.toast("✅ Journal entry saved!", icon="💾")
+
+    if not st.session_state.journal_df.empty:
+        st.markdown("**Previous Entries:**")
+        journal = _journal_arrow(st.session_state.journal_df)
+        view    = journal
+        # Long sessions: send only the latest page unless the trader asks for everything
+        if journal.num_rows > JOURNAL_PAGE and not st.toggle("Show all entries", value=False, key="j_show_all"):
+            view = journal.slice(journal.num_rows - JOURNAL_PAGE)
+        st.dataframe(view, use_container_width=True, hide_index=True, column_config=JOURNAL_COL_CFG)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# MAIN RENDER FUNCTION  — call this from app.py
+# ─────────────────────────────────────────────────────────────────────────────
+def render_feedback_page(df: pd.DataFrame, biases: dict):
+    """
+    Parameters
+    ----------
+    df     : the full cleaned trading DataFrame (columns as per CSV spec)
+    biases : dict returned by bias_engine.run_all() — read-only, may be a
+             shared cached object
+    """
+    if df.empty:
+        st.info("No trades to analyse.")
+        return
+
+    ot = biases["overtrading"]
+    la = biases["loss_aversion"]
+    rt = biases["revenge_trading"]
+
+    # ── Pre-compute stats used across sections (cached per upload) ───────────
+    stats = _compute_stats(df)
+
+    avg_win       = stats["avg_win"]
+    avg_loss      = stats["avg_loss"]
+    loss_ratio    = stats["loss_ratio"]
+    win_rate      = stats["win_rate"]
+    avg_hourly    = stats["avg_hourly"]
+    peak_hour_val = stats["peak_hour_val"]
+
+    revenge_count = rt["details"].get("revenge_trade_count", 0)
+
+    # ── Severity scores (0-100) ───────────────────────────────────────────────
+    ot_score = min(100, (peak_hour_val / max(avg_hourly * 2, 1)) * 50) if ot["flagged"] else 10
+    la_score = min(100, (loss_ratio / 1.5) * 50)                        if la["flagged"] else 10
+    rt_score = min(100, revenge_count * 20)                              if rt["flagged"] else 5
+
+    overall_score = (ot_score + la_score + rt_score) / 3
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # PAGE HEADER
+    # ─────────────────────────────────────────────────────────────────────────
+    # Static stylesheet + hero banner, built once at import time
+    st.markdown(_FB_CSS + _FB_HERO, unsafe_allow_html=True)
 
     # ─────────────────────────────────────────────────────────────────────────
     # SECTION 1 — BIAS HEALTH DASHBOARD
@@ -243,8 +436,8 @@ def render_feedback_page(df: pd.DataFrame, biases: dict):
                 icon="🚨",
             )
             # Find peak-trading hour label
-            if not hourly.empty:
-                peak_dt = hourly.idxmax()
+            if stats["peak_dt"] is not None:
+                peak_dt = stats["peak_dt"]
                 st.info(
                     f"📍 Your highest-frequency hour was **{peak_dt.strftime('%A %d %b, %H:%M')}** "
                     f"with {peak_hour_val} trades. Consider reviewing what market event or emotion "
@@ -290,8 +483,7 @@ def render_feedback_page(df: pd.DataFrame, biases: dict):
                 icon="🚨",
             )
             if rt.get("flagged_trades"):
-                flagged_df = pd.DataFrame(rt["flagged_trades"])
-                st.dataframe(flagged_df, use_container_width=True, hide_index=True)
+                st.dataframe(rt["flagged_trades_arrow"], use_container_width=True, hide_index=True)
         else:
             st.success(
                 "**Revenge Trading: Clear.** No oversized positions detected immediately after losses.",
@@ -305,140 +497,137 @@ def render_feedback_page(df: pd.DataFrame, biases: dict):
 
     tab_heat, tab_time, tab_drawdown, tab_size = st.tabs([
         "🗓️ Activity Heatmap", "⏱️ P/L Timeline", "📉 Drawdown", "📦 Trade Size Distribution"
-    ])
+    ], key="fb_active_tab", on_change="rerun")
+    # Only the selected tab builds its figures; the others stay empty until opened
+    # Cumulative and drawdown lines need at least two points
+    can_plot_lines = len(df) >= 2
 
     # ── Heatmap: day-of-week × hour-of-day ───────────────────────────────────
     with tab_heat:
-        st.markdown("**Trade frequency heatmap — Day of week vs Hour of day**")
-        df2 = df.copy()
-        df2["dow"]  = df2["timestamp"].dt.day_name()
-        df2["hour"] = df2["timestamp"].dt.hour
-        pivot = df2.groupby(["dow", "hour"]).size().reset_index(name="count")
-        days_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        pivot["dow"] = pd.Categorical(pivot["dow"], categories=days_order, ordered=True)
-        pivot = pivot.sort_values(["dow", "hour"])
-        heat_matrix = pivot.pivot_table(index="dow", columns="hour", values="count", fill_value=0)
-        fig_heat = px.imshow(
-            heat_matrix,
-            labels=dict(x="Hour of Day", y="Day of Week", color="Trades"),
-            color_continuous_scale="YlOrRd",
-            aspect="auto",
-            title="Trading Activity Heatmap",
-        )
-        fig_heat.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            xaxis=dict(title="Hour of Day", dtick=1),
-            coloraxis_colorbar=dict(title="# Trades"),
-        )
-        st.plotly_chart(fig_heat, use_container_width=True)
-        st.caption("🔴 Red clusters = high-frequency windows — cross-reference with your P/L to see if activity correlates with worse outcomes.")
+        if tab_heat.open:
+            st.markdown("**Trade frequency heatmap — Day of week vs Hour of day**")
+            fig_heat = px.imshow(
+                stats["heat_matrix"],
+                labels=dict(x="Hour of Day", y="Day of Week", color="Trades"),
+                color_continuous_scale="YlOrRd",
+                aspect="auto",
+                title="Trading Activity Heatmap",
+            )
+            fig_heat.update_layout(
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+                xaxis=dict(title="Hour of Day", dtick=1),
+                coloraxis_colorbar=dict(title="# Trades"),
+            )
+            st.plotly_chart(fig_heat, use_container_width=True)
+            st.caption("🔴 Red clusters = high-frequency windows — cross-reference with your P/L to see if activity correlates with worse outcomes.")
 
     # ── P/L colour timeline ───────────────────────────────────────────────────
     with tab_time:
-        st.markdown("**Cumulative P/L vs trade-by-trade bar**")
-        df_t = df.copy().reset_index(drop=True)
-        df_t["cumulative_pl"] = df_t["profit_loss"].cumsum()
-        df_t["trade_num"]     = range(1, len(df_t) + 1)
-
-        fig_cum = go.Figure()
-        fig_cum.add_trace(go.Scatter(
-            x=df_t["trade_num"], y=df_t["cumulative_pl"],
-            mode="lines", name="Cumulative P/L",
-            line=dict(color="#3b82f6", width=2),
-            fill="tozeroy",
-            fillcolor="rgba(59,130,246,0.1)",
-        ))
-        # Mark revenge trades if any
-        if rt.get("flagged_trades"):
-            ft = pd.DataFrame(rt["flagged_trades"])
-            if "timestamp" in ft.columns:
-                ft["timestamp"] = pd.to_datetime(ft["timestamp"])
-                merged = df_t.merge(ft[["timestamp"]], on="timestamp", how="inner")
-                fig_cum.add_trace(go.Scatter(
-                    x=merged["trade_num"], y=merged["cumulative_pl"],
+        if tab_time.open and can_plot_lines:
+            st.markdown("**Cumulative P/L vs trade-by-trade bar**")
+            trade_num = stats["trade_num"]
+            cum_pl    = stats["cum_pl"]
+            cum_keep  = stats["cum_keep"]
+            hourly_pl = stats["hourly_pl"]
+
+            # Cumulative P/L and hourly P/L share one figure (one Plotly instance)
+            fig_time = make_subplots(
+                rows=2, cols=1, shared_xaxes=False, vertical_spacing=0.15,
+                subplot_titles=("Cumulative P/L (trade-by-trade)", "Average P/L by Hour of Day"),
+            )
+            fig_time.add_trace(go.Scattergl(
+                x=trade_num[cum_keep], y=cum_pl[cum_keep],
+                mode="lines", name="Cumulative P/L",
+                line=dict(color="#3b82f6", width=2),
+                fill="tozeroy",
+                fillcolor="rgba(59,130,246,0.1)",
+            ), row=1, col=1)
+            # Mark revenge trades if any
+            if rt.get("flagged_trades"):
+                rev_idx = np.asarray([t["trade_idx"] for t in rt["flagged_trades"]])
+                fig_time.add_trace(go.Scatter(
+                    x=trade_num[rev_idx], y=cum_pl[rev_idx],
                     mode="markers", name="Revenge Trade",
                     marker=dict(color="#ef4444", size=12, symbol="x"),
-                ))
-        fig_cum.update_layout(
-            title="Cumulative P/L (trade-by-trade)",
-            xaxis_title="Trade Number",
-            yaxis_title="Cumulative P/L ($)",
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            legend=dict(orientation="h", y=1.1),
-        )
-        st.plotly_chart(fig_cum, use_container_width=True)
-
-        # Win/Loss by hour bar
-        df_t["hour"] = df_t["timestamp"].dt.hour
-        hourly_pl = df_t.groupby("hour")["profit_loss"].mean().reset_index()
-        hourly_pl["color"] = hourly_pl["profit_loss"].apply(lambda x: "#22c55e" if x >= 0 else "#ef4444")
-        fig_hr = go.Figure(go.Bar(
-            x=hourly_pl["hour"], y=hourly_pl["profit_loss"],
-            marker_color=hourly_pl["color"],
-            name="Avg P/L per Hour",
-        ))
-        fig_hr.add_hline(y=0, line_dash="dot", line_color="gray")
-        fig_hr.update_layout(
-            title="Average P/L by Hour of Day",
-            xaxis=dict(title="Hour", dtick=1),
-            yaxis_title="Avg P/L ($)",
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-        )
-        st.plotly_chart(fig_hr, use_container_width=True)
+                ), row=1, col=1)
+
+            # Win/Loss by hour bar
+            fig_time.add_trace(go.Bar(
+                x=hourly_pl["hour"], y=hourly_pl["profit_loss"],
+                marker_color=hourly_pl["color"],
+                name="Avg P/L per Hour",
+            ), row=2, col=1)
+            fig_time.add_hline(y=0, line_dash="dot", line_color="gray", row=2, col=1)
+            fig_time.update_xaxes(title_text="Trade Number", row=1, col=1)
+            fig_time.update_xaxes(title_text="Hour", dtick=1, row=2, col=1)
+            fig_time.update_yaxes(title_text="Cumulative P/L ($)", row=1, col=1)
+            fig_time.update_yaxes(title_text="Avg P/L ($)", row=2, col=1)
+            fig_time.update_layout(
+                height=800,
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+                legend=dict(orientation="h", y=1.08),
+                uirevision="fb",
+            )
+            st.plotly_chart(fig_time, use_container_width=True)
+        elif tab_time.open:
+            st.info("Need at least two trades to draw the P/L timeline.")
 
     # ── Drawdown chart ────────────────────────────────────────────────────────
     with tab_drawdown:
-        st.markdown("**Drawdown from peak balance**")
-        df_d = df.copy()
-        df_d["peak"]     = df_d["balance"].cummax()
-        df_d["drawdown"] = (df_d["balance"] - df_d["peak"]) / df_d["peak"] * 100
-
-        max_dd = df_d["drawdown"].min()
-        fig_dd = go.Figure()
-        fig_dd.add_trace(go.Scatter(
-            x=df_d["timestamp"], y=df_d["drawdown"],
-            fill="tozeroy",
-            fillcolor="rgba(239,68,68,0.18)",
-            line=dict(color="#ef4444"),
-            name="Drawdown %",
-        ))
-        fig_dd.update_layout(
-            title=f"Account Drawdown (Max: {max_dd:.1f}%)",
-            yaxis_title="Drawdown (%)",
-            xaxis_title="Time",
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-        )
-        st.plotly_chart(fig_dd, use_container_width=True)
-        if max_dd < -10:
-            st.warning(f"⚠️ Your maximum drawdown is **{max_dd:.1f}%**. Drawdowns beyond 10% significantly increase the psychological pressure that drives revenge trading and overtrading.")
-        else:
-            st.success(f"✅ Max drawdown: **{max_dd:.1f}%** — within manageable range.")
+        if tab_drawdown.open and can_plot_lines:
+            st.markdown("**Drawdown from peak balance**")
+            max_dd  = stats["max_dd"]
+            dd_keep = stats["dd_keep"]
+            fig_dd = go.Figure()
+            fig_dd.add_trace(go.Scattergl(
+                x=df["timestamp"].iloc[dd_keep], y=stats["drawdown"][dd_keep],
+                fill="tozeroy",
+                fillcolor="rgba(239,68,68,0.18)",
+                line=dict(color="#ef4444"),
+                name="Drawdown %",
+            ))
+            fig_dd.update_layout(
+                title=f"Account Drawdown (Max: {max_dd:.1f}%)",
+                yaxis_title="Drawdown (%)",
+                xaxis_title="Time",
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+                uirevision="fb",
+            )
+            st.plotly_chart(fig_dd, use_container_width=True)
+            if max_dd < -10:
+                st.warning(f"⚠️ Your maximum drawdown is **{max_dd:.1f}%**. Drawdowns beyond 10% significantly increase the psychological pressure that drives revenge trading and overtrading.")
+            else:
+                st.success(f"✅ Max drawdown: **{max_dd:.1f}%** — within manageable range.")
+        elif tab_drawdown.open:
+            st.info("Need at least two trades to draw the drawdown chart.")
 
     # ── Trade size distribution ───────────────────────────────────────────────
     with tab_size:
-        st.markdown("**Trade size distribution — spot oversized outliers**")
-        avg_qty = df["quantity"].mean()
-        fig_size = px.histogram(
-            df, x="quantity", nbins=40,
-            title="Distribution of Trade Sizes (Quantity)",
-            color_discrete_sequence=["#6366f1"],
-        )
-        fig_size.add_vline(x=avg_qty, line_dash="dash", line_color="gold",
-                           annotation_text=f"Avg: {avg_qty:.2f}", annotation_position="top right")
-        fig_size.add_vline(x=avg_qty * 1.5, line_dash="dot", line_color="#ef4444",
-                           annotation_text="1.5× (Revenge threshold)", annotation_position="top right")
-        fig_size.update_layout(
-            xaxis_title="Quantity", yaxis_title="Count",
-            paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)"
-        )
-        st.plotly_chart(fig_size, use_container_width=True)
-
-        outlier_count = len(df[df["quantity"] > avg_qty * 1.5])
-        st.info(f"**{outlier_count}** trades ({outlier_count/len(df)*100:.1f}%) exceeded 1.5× your average size — these are potential revenge or impulsive trades.")
+        if tab_size.open:
+            st.markdown("**Trade size distribution — spot oversized outliers**")
+            avg_qty = stats["avg_qty"]
+            edges    = stats["size_edges"]
+            fig_size = go.Figure(go.Bar(
+                x=(edges[:-1] + edges[1:]) / 2, y=stats["size_counts"],
+                width=np.diff(edges),
+                marker_color="#6366f1",
+            ))
+            fig_size.add_vline(x=avg_qty, line_dash="dash", line_color="gold",
+                               annotation_text=f"Avg: {avg_qty:.2f}", annotation_position="top right")
+            fig_size.add_vline(x=avg_qty * 1.5, line_dash="dot", line_color="#ef4444",
+                               annotation_text="1.5× (Revenge threshold)", annotation_position="top right")
+            fig_size.update_layout(
+                title="Distribution of Trade Sizes (Quantity)",
+                xaxis_title="Quantity", yaxis_title="Count",
+                paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)"
+            )
+            st.plotly_chart(fig_size, use_container_width=True)
+
+            outlier_count = stats["outlier_count"]
+            st.info(f"**{outlier_count}** trades ({outlier_count/len(df)*100:.1f}%) exceeded 1.5× your average size — these are potential revenge or impulsive trades.")
 
     # ─────────────────────────────────────────────────────────────────────────
     # SECTION 4 — PERSONALISED SUGGESTIONS
@@ -545,12 +734,7 @@ def render_feedback_page(df: pd.DataFrame, biases: dict):
 
     # Overtrading control
     with st.expander("⏱️ Frequency Control", expanded=ot["flagged"]):
-        best_hours = []
-        if not hourly.empty:
-            df_t2 = df.copy()
-            df_t2["hour"] = df_t2["timestamp"].dt.hour
-            hour_pl = df_t2.groupby("hour")["profit_loss"].mean()
-            best_hours = hour_pl.nlargest(3).index.tolist()
+        best_hours = stats["best_hours"]
 
         st.markdown(f"""
         <div class="insight-box">
@@ -621,39 +805,14 @@ def render_feedback_page(df: pd.DataFrame, biases: dict):
     # ─────────────────────────────────────────────────────────────────────────
     # SECTION 6 — INTERACTIVE JOURNAL ENTRY
     # ─────────────────────────────────────────────────────────────────────────
-    st.markdown('<p class="section-head">✍️ Log a Journal Entry</p>', unsafe_allow_html=True)
+    # Static header lives in the page body, so fragment reruns don't re-send it
+    st.markdown(_JOURNAL_HEADER_HTML, unsafe_allow_html=True)
     st.markdown("Record your reflections directly in the app. Entries are stored for the session.")
-
-    if "journal_entries" not in st.session_state:
-        st.session_state.journal_entries = []
-
-    with st.form("journal_form"):
-        j_date   = st.date_input("Session date", value=datetime.today())
-        j_mood   = st.select_slider("Emotional state before session", options=["Very Calm", "Calm", "Neutral", "Anxious", "Very Anxious"], value="Neutral")
-        j_plan   = st.text_area("What was your pre-session plan?", placeholder="E.g. Max 3 trades, only BTC, wait for support level confirmation...")
-        j_debrief= st.text_area("Post-session debrief", placeholder="What happened? Did you stick to the plan?")
-        j_bias   = st.multiselect("Which biases showed up today (self-assessed)?", ["Overtrading", "Loss Aversion", "Revenge Trading", "FOMO", "None"])
-        j_lesson = st.text_area("One lesson from today", placeholder="e.g. I need to wait 10 min after entry before checking P/L...")
-        submit   = st.form_submit_button("💾 Save Entry", type="primary")
-
-    if submit:
-        entry = {
-            "date":     str(j_date),
-            "mood":     j_mood,
-            "plan":     j_plan,
-            "debrief":  j_debrief,
-            "biases":   ", ".join(j_bias) if j_bias else "None",
-            "lesson":   j_lesson,
-        }
-        st.session_state.journal_entries.append(entry)
-        st.success("✅ Journal entry saved!")
-
-    if st.session_state.journal_entries:
-        st.markdown("**Previous Entries This Session:**")
-        st.dataframe(pd.DataFrame(st.session_state.journal_entries), use_container_width=True, hide_index=True)
+    _journal_fragment()
 
     # ─────────────────────────────────────────────────────────────────────────
     # FOOTER
     # ─────────────────────────────────────────────────────────────────────────
+    # Page level, outside _journal_fragment: a journal save never re-sends these
     st.divider()
-    st.caption("NBC Bias Detector · Feedback & Recommendations · Educational purposes only — not financial advice.")
\ No newline at end of file
+    st.caption(_FB_FOOTER)
\ No newline at end of file